@@ -1,34 +1,95 @@
+import asyncio
 import os
+import time
+from pathlib import Path
 
 import discord
 from discord.ext import commands
 from redis.asyncio import Redis
 
+from bot.loudness import LoudnessAnalyzer
 from bot.util.cache import VideoInfoCache
+from bot.util.helpers import timed
+from bot.youtube import preload_ytdl
 
 ENABLED_COGS = ("music_player",)
+# Connections opened up front so the first commands don't wait on handshakes
+REDIS_WARM_CONNECTIONS = 4
 
 
 class MusicBotRedux(commands.Bot):
     cache: VideoInfoCache
+    loudness: LoudnessAnalyzer
     redis: Redis
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, started_at: float | None = None, **kwargs):
         intents = discord.Intents.default()
         intents.message_content = True
         intents.voice_states = True
         super().__init__(*args, intents=intents, command_prefix=["-", "!!"], **kwargs)
+        # Launcher passes the process start so import time is included
+        self.started_at = started_at or time.perf_counter()
+        self.startup_logged = False
+        self.warmup_task: asyncio.Task | None = None
+        self.ready_file = Path(os.getenv("READY_FILE") or "/tmp/musicboy.ready")
+        self.ready_file.unlink(missing_ok=True)
 
     async def setup_hook(self):
         self.redis = Redis.from_url(os.getenv("REDIS_URL") or "redis://localhost:6379")
         self.cache = VideoInfoCache(self.redis)
+        self.loudness = LoudnessAnalyzer(self.cache)
+
+        # Not awaited: the gateway connection shouldn't wait on yt-dlp
+        self.warmup_task = asyncio.create_task(self.warm_ytdl())
+
+        with timed("Setup"):
+            await asyncio.gather(
+                self.warm_redis(),
+                *(self.load_cog(cog) for cog in ENABLED_COGS),
+            )
+
+    async def warm_redis(self):
+        with timed("Redis warmup"):
+            await asyncio.gather(
+                *(self.redis.ping() for _ in range(REDIS_WARM_CONNECTIONS))
+            )
         print("✅ Cache initialized")
 
-        for cog in ENABLED_COGS:
+    async def warm_ytdl(self):
+        try:
+            with timed("yt-dlp import"):
+                await self.loop.run_in_executor(None, preload_ytdl)
+        except Exception as e:
+            # Extraction imports it again on demand, so this is only a lost warmup
+            print("yt-dlp warmup failed", e)
+
+    async def load_cog(self, cog: str):
+        with timed(f"Loading cog {cog}"):
             await self.load_extension(f"bot.cogs.{cog}")
-            print("✅ Loaded cog", cog)
+        print("✅ Loaded cog", cog)
 
     async def on_ready(self):
         print(
             f"ℹ️ Logged in as {self.user} (ID:{self.application_id}) 🕐 {discord.utils.utcnow()}"
         )
+        if not self.startup_logged:
+            self.startup_logged = True
+            print(f"⏱️ Ready in {time.perf_counter() - self.started_at:.2f}s")
+        self.mark_ready()
+
+    async def on_resumed(self):
+        self.mark_ready()
+
+    async def on_disconnect(self):
+        self.ready_file.unlink(missing_ok=True)
+
+    def mark_ready(self):
+        self.ready_file.write_text(discord.utils.utcnow().isoformat())
+
+    async def close(self):
+        self.ready_file.unlink(missing_ok=True)
+        if self.warmup_task is not None:
+            self.warmup_task.cancel()
+        if hasattr(self, "loudness"):
+            await self.loudness.close()
+        await super().close()
@@ -37,6 +37,11 @@ class MusicPlayer(commands.Cog):
             return await ctx.message.add_reaction("❌")
 
         if info:
+            # Measure what's playing now and prefetch the next one
+            self.bot.loudness.schedule(info, ctx.guild.id)
+            if upcoming := state.peek_next():
+                self.bot.loudness.schedule(upcoming, ctx.guild.id)
+
             ctx.voice_client.play(
                 YTDLSource.from_video_info(info, volume=self._volume[ctx.guild.id]),
                 after=lambda _: self.bot.loop.create_task(self.play_next(ctx)),
@@ -54,6 +59,12 @@ class MusicPlayer(commands.Cog):
             )
             await ctx.voice_client.disconnect()
 
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        # Covers !stop, the queue finishing, and being kicked from the channel
+        if member == self.bot.user and after.channel is None:
+            self.bot.loudness.cancel(member.guild.id)
+
     @commands.command(aliases=["np"])
     async def now_playing(self, ctx):
         state = self.get_state(ctx.guild.id)
@@ -0,0 +1,168 @@
+import asyncio
+import math
+import re
+import time
+
+import orjson
+from redis.exceptions import RedisError
+
+from bot.util.cache import VideoInfoCache
+from bot.youtube import VideoInfo
+
+# EBU R128 integrated loudness every track is normalized towards
+TARGET_LUFS = -14.0
+# Keep the correction sane for near-silent or heavily clipped tracks
+MIN_GAIN = 0.25
+MAX_GAIN = 2.0
+# True peak (dBTP) the corrected track may reach; any higher and audioop clips it
+TRUE_PEAK_CEILING = -1.0
+MAX_CONCURRENT_ANALYSES = 2
+# ffmpeg gets the track's length plus some slack before it's killed
+ANALYSIS_TIMEOUT_SLACK = 30.0
+# Don't retry a failed track (e.g. an expired audio URL) until this many seconds pass
+FAILURE_BACKOFF = 60.0 * 60
+
+_LOUDNORM_JSON = re.compile(rb"\{[^{}]*\"input_i\"[^{}]*\}")
+
+
+class LoudnessAnalysisFailed(Exception):
+    pass
+
+
+def lufs_to_gain(input_i: float, input_tp: float, target: float = TARGET_LUFS):
+    """Converts a measured integrated loudness to a linear volume factor.
+
+    Boosts are capped so the track's true peak stays under TRUE_PEAK_CEILING.
+    """
+    if not math.isfinite(input_i):
+        return 1.0
+    gain = 10 ** ((target - input_i) / 20)
+    if math.isfinite(input_tp):
+        gain = min(gain, max(10 ** ((TRUE_PEAK_CEILING - input_tp) / 20), 1.0))
+    return min(max(gain, MIN_GAIN), MAX_GAIN)
+
+
+async def measure_loudness(audio_url: str, timeout: float) -> tuple[float, float]:
+    """Runs a single ffmpeg loudnorm pass over the stream.
+
+    Returns its integrated loudness (LUFS) and true peak (dBTP).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        audio_url,
+        "-vn",
+        "-af",
+        f"loudnorm=I={TARGET_LUFS}:print_format=json",
+        "-f",
+        "null",
+        "-",
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        raise LoudnessAnalysisFailed(f"ffmpeg timed out after {timeout:.0f}s")
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        raise LoudnessAnalysisFailed(f"ffmpeg exited with {proc.returncode}")
+
+    match = _LOUDNORM_JSON.search(stderr)
+    if match is None:
+        raise LoudnessAnalysisFailed("ffmpeg produced no loudnorm report")
+
+    report = orjson.loads(match.group())
+    return float(report["input_i"]), float(report["input_tp"])
+
+
+class LoudnessAnalyzer:
+    """Measures each track's loudness once in the background and stores the resulting gain in the cache."""
+
+    def __init__(self, cache: VideoInfoCache):
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+        # Every queued copy of a track waiting on the same measurement
+        self._pending: dict[str, list[VideoInfo]] = {}
+        # Guilds that asked for each in-flight measurement
+        self._owners: dict[str, set[int]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        # URL -> monotonic time of its last failed analysis
+        self._failed: dict[str, float] = {}
+
+    def schedule(self, info: VideoInfo, guild_id: int):
+        now = time.monotonic()
+        self._failed = {
+            url: failed_at
+            for url, failed_at in self._failed.items()
+            if now - failed_at < FAILURE_BACKOFF
+        }
+
+        # Live streams and tracks of unknown length would never finish
+        if info.gain is not None or info.duration == 0:
+            return
+        if info.url in self._pending:
+            self._pending[info.url].append(info)
+            self._owners[info.url].add(guild_id)
+            return
+        if info.url in self._failed:
+            return
+
+        self._pending[info.url] = [info]
+        self._owners[info.url] = {guild_id}
+        self._tasks[info.url] = asyncio.create_task(self._analyze(info))
+
+    def cancel(self, guild_id: int):
+        """Drops a guild's interest in its in-flight measurements, stopping any nobody else needs."""
+        for url, owners in list(self._owners.items()):
+            owners.discard(guild_id)
+            if not owners:
+                self._tasks[url].cancel()
+                self._forget(url)
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, url: str):
+        self._pending.pop(url, None)
+        self._owners.pop(url, None)
+        self._tasks.pop(url, None)
+
+    async def _analyze(self, info: VideoInfo):
+        task = asyncio.current_task()
+        try:
+            async with self._semaphore:
+                input_i, input_tp = await measure_loudness(
+                    info.audio_url, info.duration + ANALYSIS_TIMEOUT_SLACK
+                )
+
+            gain = lufs_to_gain(input_i, input_tp)
+            info.gain = gain
+            try:
+                # Persist before un-pending so a concurrent add can't miss the gain
+                await self.cache.set(info)
+            except RedisError as e:
+                print("Failed to cache loudness gain for", info.url, e)
+
+            for waiting in self._pending.get(info.url, []):
+                waiting.gain = gain
+            print(
+                f"Measured {input_i:.1f} LUFS / {input_tp:.1f} dBTP for {info.url}, gain {gain:.2f}"
+            )
+        except Exception as e:
+            print("Loudness analysis failed for", info.url, e)
+            self._failed[info.url] = time.monotonic()
+        finally:
+            # A cancelled task may already have been replaced by a newer one
+            if self._tasks.get(info.url) is task:
+                self._forget(info.url)
@@ -43,6 +43,11 @@ class PlayerState:
             return self.current_track
         return None
 
+    def peek_next(self):
+        if self.current_index + 1 < len(self.queue):
+            return self.queue[self.current_index + 1]
+        return None
+
     def get_previous(self):
         if self.current_index > 0:
             self.current_index -= 1
@@ -1,4 +1,6 @@
+import time
 from collections.abc import Sequence
+from contextlib import contextmanager
 from typing import TypeVar
 
 T = TypeVar("T")
@@ -22,3 +24,12 @@ def draw_progress_bar(progress: float, total: int, length: int = 20):
         + "▓▒"
         + "░" * (length - int(length * percent))
     )
+
+
+@contextmanager
+def timed(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        print(f"⏱️ {phase} took {(time.perf_counter() - start) * 1000:.0f}ms")
@@ -5,7 +5,6 @@ from typing import Any
 from urllib import parse
 
 import discord
-import yt_dlp
 
 
 class SongNotFound(Exception):
@@ -29,18 +28,22 @@ FFMPEG_OPTIONS = {
 }
 
 
-async def get_playlist_urls(url: str, *, loop: asyncio.AbstractEventLoop | None = None):
-    """Retrieves a list of all URLs from a playlist without downloading/processing audio yet."""
-    loop = loop or asyncio.get_event_loop()
+def _extract_playlist(url: str) -> Mapping[str, Any] | None:
+    # Runs in the executor so the event loop never imports yt-dlp itself
+    import yt_dlp
 
     # Use specific options for quick metadata extraction
     meta_opts = YTDL_OPTIONS.copy()
     meta_opts["extract_flat"] = True
 
     with yt_dlp.YoutubeDL(meta_opts) as ydl:  # type: ignore
-        data: Mapping[str, Any] = await loop.run_in_executor(
-            None, lambda: ydl.extract_info(url, download=False)
-        )
+        return ydl.extract_info(url, download=False)
+
+
+async def get_playlist_urls(url: str, *, loop: asyncio.AbstractEventLoop | None = None):
+    """Retrieves a list of all URLs from a playlist without downloading/processing audio yet."""
+    loop = loop or asyncio.get_event_loop()
+    data = await loop.run_in_executor(None, _extract_playlist, url)
 
     if not data:
         raise SongNotFound(f"Couldn't find playlist data for {url}")
@@ -62,6 +65,8 @@ class VideoInfo:
     audio_url: str
     url: str
     duration: int
+    # Linear loudness correction, filled in once the track has been analyzed
+    gain: float | None = None
 
 
 def parse_yt_url(url: str):
@@ -75,7 +80,23 @@ def parse_yt_url(url: str):
         return f"https://www.youtube.com/watch?v={v}"
 
 
+def preload_ytdl():
+    """Imports yt-dlp and its extractors ahead of the first request.
+
+    yt-dlp is imported lazily so startup doesn't pay for it; call this from an
+    executor thread to warm it up in the background instead.
+    """
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:  # type: ignore
+        # Extractors are lazy; resolving them pulls in the real modules
+        for ie_key in ("Youtube", "YoutubeTab"):
+            ydl.get_info_extractor(ie_key)
+
+
 def get_video_info(url: str):
+    import yt_dlp
+
     with yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:  # type: ignore
         data = ydl.extract_info(url, download=False)
 
@@ -95,10 +116,20 @@ def get_video_info(url: str):
 
 
 class YTDLSource(discord.PCMVolumeTransformer):
-    def __init__(self, source: discord.AudioSource, volume=0.5):
+    def __init__(self, source: discord.AudioSource, volume=0.5, gain=1.0):
+        self.gain = gain
         super().__init__(source, volume)
         self.read_count = 0
 
+    @property
+    def volume(self):
+        """The user-facing volume, excluding the track's loudness gain."""
+        return self._volume / self.gain
+
+    @volume.setter
+    def volume(self, value: float):
+        self._volume = max(value * self.gain, 0.0)
+
     def read(self):
         data = super().read()
         if data:
@@ -115,4 +146,5 @@ class YTDLSource(discord.PCMVolumeTransformer):
         return cls(
             discord.FFmpegPCMAudio(info.audio_url, options=FFMPEG_OPTIONS["options"]),
             volume=volume,
+            gain=info.gain or 1.0,
         )
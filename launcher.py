@@ -1,3 +1,8 @@
+import time
+
+# Taken before the heavy imports below so startup timing covers them
+STARTED_AT = time.perf_counter()
+
 import asyncio
 import logging
 import os
@@ -21,7 +26,7 @@ async def main():
     if not discord.opus.is_loaded():
         raise Exception("Failed to load opus")
 
-    bot = MusicBotRedux()
+    bot = MusicBotRedux(started_at=STARTED_AT)
     await bot.start(os.environ["BOT_TOKEN"])
 
 